@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import chess
+import evaluators
+from minimax_engine import MinimaxEngine
+
+"""
+Batch analysis of FEN/EPD files
+
+Positions are read one line at a time, analyzed by a pool of worker processes each
+holding its own MinimaxEngine, and written out as JSONL in input order as soon as
+they are done. Only a bounded number of positions are in flight at once, so memory
+use does not depend on the size of the input. Example:
+
+  python3 analyze.py positions.epd --depth 3 --workers 8 -o results.jsonl
+  python3 analyze.py big.fen --nodes 20000 > results.jsonl
+"""
+
+# Engine owned by each worker process, created once by _init_worker
+_engine = None
+
+
+def parse_position(line: str):
+    """
+    Parses a FEN or EPD line into (board, epd_operations).
+    Returns None for blank lines and comments.
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    try:
+        return chess.Board(line), {}
+    except ValueError:
+        board = chess.Board()
+        ops = board.set_epd(line)
+        return board, ops
+
+
+def _init_worker(evaluator_name, use_alphabeta):
+    global _engine
+    _engine = MinimaxEngine(name="Batch analysis", evaluator=getattr(evaluators, evaluator_name),
+                            use_alphabeta=use_alphabeta)
+
+
+def _analyze_line(args):
+    """Pool worker: analyzes one input line and returns its result record"""
+    source, line_number, line, depth, node_limit, time_limit = args
+    record = {"source": source, "line": line_number}
+    try:
+        parsed = parse_position(line)
+    except ValueError as e:
+        record["error"] = str(e)
+        return record
+    if parsed is None:
+        return None
+
+    board, ops = parsed
+    record["fen"] = board.fen()
+    if "id" in ops:
+        record["id"] = ops["id"]
+    if not board.is_valid():
+        status = board.status()
+        reasons = [flag.name.lower() for flag in chess.Status if flag and flag in status]
+        record["error"] = "invalid position: " + ", ".join(reasons)
+        return record
+
+    start = time.time()
+    try:
+        move = _engine.find_best_move(board, max_depth=depth, time_limit=time_limit, node_limit=node_limit)
+    except Exception as e:
+        # one bad position must not stop the whole batch
+        record["error"] = f"{type(e).__name__}: {e}"
+        return record
+    record["bestmove"] = move.uci() if move else None
+    record["score"] = _engine.last_score
+    # depth of the deepest iteration that finished, which may be less than requested
+    record["depth"] = _engine.last_depth
+    record["nodes"] = _engine.nodes
+    record["time"] = round(time.time() - start, 3)
+    return record
+
+
+def read_lines(paths):
+    """Lazily yields (path, line_number, line) for every line of the given files"""
+    for path in paths:
+        f = sys.stdin if path == "-" else open(path)
+        try:
+            for line_number, line in enumerate(f, start=1):
+                yield path, line_number, line
+        finally:
+            if f is not sys.stdin:
+                f.close()
+
+
+def analyze_stream(lines, out, depth=3, node_limit=None, time_limit=None,
+                   evaluator_name="REvaluator", use_alphabeta=True, workers=None, max_pending=None):
+    """
+    Analyzes every (source, line_number, line) in the iterable lines and writes
+    one JSON object per position to out, preserving input order. At most
+    max_pending positions (default 4 per worker) are queued at any time.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 4 * workers
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(evaluator_name, use_alphabeta)) as pool:
+        pending = deque()
+
+        def write_oldest():
+            record = pending.popleft().result()
+            if record is not None:
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+
+        for source, line_number, line in lines:
+            job = (source, line_number, line, depth, node_limit, time_limit)
+            pending.append(pool.submit(_analyze_line, job))
+            if len(pending) >= max_pending:
+                write_oldest()
+
+        while pending:
+            write_oldest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze FEN/EPD positions with MinimaxEngine")
+    parser.add_argument("input", nargs="+", help="FEN or EPD files, one position per line ('-' for stdin)")
+    parser.add_argument("-o", "--output", help="JSONL output file (default: stdout)")
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--nodes", type=int, default=None, help="node limit per position")
+    parser.add_argument("--movetime", type=float, default=None, help="time limit per position in seconds")
+    parser.add_argument("--evaluator", default="REvaluator", help="name of a function in evaluators.py")
+    parser.add_argument("--no-alphabeta", action="store_true", help="use plain minimax")
+    parser.add_argument("--workers", type=int, default=None, help="number of processes (default: CPU count)")
+    args = parser.parse_args()
+
+    if not callable(getattr(evaluators, args.evaluator, None)):
+        parser.error(f"unknown evaluator {args.evaluator}")
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    try:
+        analyze_stream(read_lines(args.input), out, depth=args.depth,
+                       node_limit=args.nodes, time_limit=args.movetime,
+                       evaluator_name=args.evaluator, use_alphabeta=not args.no_alphabeta,
+                       workers=args.workers)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -11,9 +11,10 @@ class ChessEngine(ABC):
         self.name = name
 
     @abstractmethod
-    def find_best_move(self, board: chess.Board, max_depth=1, time_limit=None) -> chess.Move:
+    def find_best_move(self, board: chess.Board, max_depth=1, time_limit=None, node_limit=None) -> chess.Move:
         """
         Given a board position, return the best move according to this engine.
+        Search is bounded by max_depth, time_limit (seconds) and/or node_limit (nodes visited).
         """
         pass
 
@@ -8,36 +8,103 @@ import time
 # - develop good evaluators
 # - tune the engine for depth and time constraints
 
+
+class SearchAborted(Exception):
+    """Raised inside the search when the node or time budget runs out"""
+    pass
+
+
 class MinimaxEngine(ChessEngine):
     """A simple minimax search engine with optional alpha-beta pruning."""
 
-    def __init__(self, name="MinimaxEngine", evaluator=None, use_alphabeta=True, max_depth=4):
+    def __init__(self, name="MinimaxEngine", evaluator=None, use_alphabeta=True, max_depth=4, node_limit=None):
         super().__init__(name=name)
         self.use_alphabeta = use_alphabeta
         self.max_depth = max_depth
+        self.node_limit = node_limit
         self.evaluator = evaluator
 
-    def find_best_move(self, board: chess.Board, max_depth=None, time_limit=1.0) -> chess.Move:
+        # Statistics of the last search, filled in by find_best_move
+        self.nodes = 0
+        self.last_score = None
+        self.last_depth = 0
+        self._node_budget = None
+        self._deadline = math.inf
+
+    def find_best_move(self, board: chess.Board, max_depth=None, time_limit=1.0, node_limit=None) -> chess.Move:
+        """
+        Searches with iterative deepening up to max_depth (or self.max_depth) and
+        returns the best move of the deepest iteration that finished.
+        time_limit (seconds) and node_limit (or self.node_limit) abort the search
+        once exceeded; either may be None.
+        The score, completed depth and node count of the search are left in
+        self.last_score, self.last_depth and self.nodes.
+        """
         depth = max_depth or self.max_depth
 
         start_time = time.time()
-        deadline = start_time + time_limit
+        self._deadline = start_time + time_limit if time_limit is not None else math.inf
+
+        self.nodes = 0
+        self._node_budget = node_limit if node_limit is not None else self.node_limit
+        self.last_depth = 0
 
         best_move = None
-        best_value = -math.inf if board.turn == chess.WHITE else math.inf
+        best_value = None
 
         moves = forcedCaptureLegalMoves(board)
         if not moves:
             moves = list(board.legal_moves)
+        if not moves:
+            # checkmate or stalemate: nothing to search
+            self.last_score = None
+            return None
+
+        for d in range(1, depth + 1):
+            try:
+                best_move, best_value = self._search_root(board, moves, d)
+            except SearchAborted:
+                break
+            self.last_depth = d
+            # search the best move so far first on the next iteration
+            moves.remove(best_move)
+            moves.insert(0, best_move)
+
+        # Out of budget before depth 1 finished: play something legal
+        if best_move is None:
+            best_move = moves[0]
+            best_value = None
 
+        self.last_score = best_value
+        return best_move
+
+    def _search_root(self, board, moves, depth):
+        """
+        Searches every root move to depth, returning (best_move, best_value).
+        With alpha-beta, the best value so far bounds the search of later moves,
+        so putting a good move first prunes more.
+        """
+        best_move = None
+        best_value = -math.inf if board.turn == chess.WHITE else math.inf
+
+        root_ply = len(board.move_stack)
         for move in moves:
-            if time.time() >= deadline:
-                break
             board.push(move)
-            if self.use_alphabeta:
-                value = self._alphabeta(board, depth - 1, -math.inf, math.inf, not board.turn)
-            else:
-                value = self._minimax(board, depth - 1, not board.turn)
+            try:
+                if self.use_alphabeta:
+                    # a move that cannot beat best_value only needs a bound, not an exact value
+                    if board.turn == chess.BLACK:
+                        alpha, beta = best_value, math.inf
+                    else:
+                        alpha, beta = -math.inf, best_value
+                    value = self._alphabeta(board, depth - 1, alpha, beta, not board.turn)
+                else:
+                    value = self._minimax(board, depth - 1, not board.turn)
+            except SearchAborted:
+                # unwind the moves left on the board by the aborted search
+                while len(board.move_stack) > root_ply:
+                    board.pop()
+                raise
             board.pop()
 
             if board.turn == chess.WHITE and value > best_value:
@@ -45,12 +112,19 @@ class MinimaxEngine(ChessEngine):
             elif board.turn == chess.BLACK and value < best_value:
                 best_value, best_move = value, move
 
-            if time.time() >= deadline:
-                break
+        return best_move, best_value
 
-        return best_move
+    def _visit(self):
+        # the node that would exceed the budget is not counted, so self.nodes <= node_limit
+        if self._node_budget is not None and self.nodes >= self._node_budget:
+            raise SearchAborted()
+        self.nodes += 1
+        # checking the clock on every node is too slow
+        if self.nodes % 256 == 0 and time.time() >= self._deadline:
+            raise SearchAborted()
 
     def _minimax(self, board, depth, maximizing):
+        self._visit()
         if depth == 0 or board.is_game_over():
             return self.evaluate(board)
 
@@ -74,6 +148,7 @@ class MinimaxEngine(ChessEngine):
             return value
 
     def _alphabeta(self, board, depth, alpha, beta, maximizing):
+        self._visit()
         if depth == 0 or board.is_game_over():
             return self.evaluate(board)
         
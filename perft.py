@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+import argparse
+import time
+from multiprocessing import Pool
+
+import chess
+import chess.polyglot
+from helpers import forcedCaptureLegalMoves
+
+"""
+Perft for the Forced Capture variant
+
+Counts the leaf nodes of the move tree to a fixed depth using forcedCaptureLegalMoves,
+so it can be used both to check move generation against known counts and to measure
+nodes/sec when optimizing it. Example:
+
+  python3 perft.py 4 --divide --hash --processes 4
+  python3 perft.py 3 --fen "rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2"
+
+Known start position counts: 20, 400, 8067, 152955, 2723795 (depths 1-5)
+"""
+
+
+class PerftTable:
+    """
+    Transposition table for perft counts, keyed by (zobrist hash, depth).
+    Once max_entries counts are stored, new ones are dropped, so memory stays bounded.
+    """
+
+    def __init__(self, max_entries=1 << 20):
+        self.max_entries = max_entries
+        self.entries = {}
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def store(self, key, nodes):
+        if len(self.entries) < self.max_entries:
+            self.entries[key] = nodes
+
+
+def perft(board: chess.Board, depth: int, table=None) -> int:
+    """
+    Number of leaf nodes reachable from board in exactly depth plies.
+    The last ply is bulk counted (moves are counted, not played).
+    If table is a PerftTable, it is used to cache counts of transposed positions.
+    """
+    if depth == 0:
+        return 1
+
+    moves = forcedCaptureLegalMoves(board)
+    if depth == 1:
+        return len(moves)
+
+    if table is not None:
+        key = (chess.polyglot.zobrist_hash(board), depth)
+        cached = table.get(key)
+        if cached is not None:
+            return cached
+
+    nodes = 0
+    for move in moves:
+        board.push(move)
+        nodes += perft(board, depth - 1, table)
+        board.pop()
+
+    if table is not None:
+        table.store(key, nodes)
+    return nodes
+
+
+def _perft_root_move(args):
+    """Pool worker: counts the subtree below a single root move"""
+    fen, move_uci, depth, hash_size = args
+    board = chess.Board(fen)
+    board.push(chess.Move.from_uci(move_uci))
+    return perft(board, depth - 1, PerftTable(hash_size) if hash_size else None)
+
+
+def divide(board: chess.Board, depth: int, hash_size=0, processes=1):
+    """
+    Returns a list of (move, nodes) pairs, one per root move.
+    hash_size > 0 enables a PerftTable of that many entries (one per process).
+    With processes > 1 the root moves are split across a process pool.
+    """
+    if depth < 1:
+        raise ValueError("divide requires depth >= 1")
+
+    moves = forcedCaptureLegalMoves(board)
+
+    if processes > 1 and depth > 1:
+        fen = board.fen()
+        jobs = [(fen, move.uci(), depth, hash_size) for move in moves]
+        with Pool(processes) as pool:
+            counts = pool.map(_perft_root_move, jobs, chunksize=1)
+        return list(zip(moves, counts))
+
+    table = PerftTable(hash_size) if hash_size else None
+    results = []
+    for move in moves:
+        board.push(move)
+        results.append((move, perft(board, depth - 1, table)))
+        board.pop()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Forced Capture perft")
+    parser.add_argument("depth", type=int)
+    parser.add_argument("--fen", default=chess.STARTING_FEN)
+    parser.add_argument("--divide", action="store_true", help="print node counts per root move")
+    parser.add_argument("--hash", action="store_true", help="cache counts of transposed positions")
+    parser.add_argument("--hash-size", type=int, default=1 << 20, help="maximum number of cached counts")
+    parser.add_argument("--processes", type=int, default=1, help="split root moves across this many processes")
+    args = parser.parse_args()
+
+    board = chess.Board(args.fen)
+
+    start = time.time()
+    if args.depth == 0:
+        results = []
+        nodes = 1
+    else:
+        hash_size = args.hash_size if args.hash else 0
+        results = divide(board, args.depth, hash_size=hash_size, processes=args.processes)
+        nodes = sum(count for _, count in results)
+    elapsed = time.time() - start
+
+    if args.divide:
+        for move, count in results:
+            print(f"{move.uci()}: {count}")
+        print()
+
+    nps = nodes / elapsed if elapsed > 0 else 0
+    print(f"Nodes: {nodes}")
+    print(f"Time: {elapsed:.3f}s")
+    print(f"NPS: {nps:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,5 +9,5 @@ class RandomEngine(ChessEngine):
     def __init__(self):
         super().__init__(name="RandomEngine")
 
-    def find_best_move(self, board: chess.Board, max_depth=1, time_limit=None) -> chess.Move:
+    def find_best_move(self, board: chess.Board, max_depth=1, time_limit=None, node_limit=None) -> chess.Move:
         return random.choice(forcedCaptureLegalMoves(board))
\ No newline at end of file
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import chess
+import numpy as np
+import evaluators
+from helpers import forcedCaptureLegalMoves
+from minimax_engine import MinimaxEngine
+
+"""
+Self-play data generation
+
+Worker processes play MinimaxEngine against itself from randomized openings and
+send back every position of the game with its search score and the final result.
+The main process appends them to fixed-size memory-mapped .npy shards in an output
+directory and keeps a small index.json up to date, so a run can be stopped at any
+time and resumed with the same command. Example:
+
+  python3 selfplay.py data/ --positions 10000000 --nodes 2000 --workers 8
+
+Reading the data back:
+
+  index = json.load(open("data/index.json"))
+  shard = np.load("data/" + index["shards"][0]["file"], mmap_mode="r")[:index["shards"][0]["count"]]
+  board = decode_position(shard[0])
+  full_depth = shard[shard["depth"] == 3]   # with --depth 3, drops scores from searches cut short
+"""
+
+# One record per position. board holds a 4-bit piece code per square (see encode_position),
+# flags holds the side to move (bit 0) and castling rights (bits 1-4), ep is the en passant
+# square or -1. score and result are from white's point of view. depth is the deepest
+# search iteration that finished within the node limit (0 if none did, with score NaN);
+# filter on it to train only on scores from full-depth searches.
+RECORD_DTYPE = np.dtype([
+    ("board", np.uint8, 32),
+    ("flags", np.uint8),
+    ("ep", np.int8),
+    ("score", np.float32),
+    ("depth", np.uint8),
+    ("result", np.int8),
+    ("ply", np.uint16),
+    ("game", np.uint32),
+])
+
+CASTLING_SQUARES = (chess.H1, chess.A1, chess.H8, chess.A8)
+RESULTS = {"1-0": 1, "0-1": -1}
+
+# Engine owned by each worker process, created once by _init_worker
+_engine = None
+
+
+def encode_position(board: chess.Board):
+    """Returns the (board, flags, ep) fields of a record for this position"""
+    codes = np.zeros(64, dtype=np.uint8)
+    for sq, piece in board.piece_map().items():
+        codes[sq] = piece.piece_type + (0 if piece.color == chess.WHITE else 8)
+    packed = codes[0::2] | (codes[1::2] << 4)
+
+    flags = 1 if board.turn == chess.WHITE else 0
+    for i, sq in enumerate(CASTLING_SQUARES):
+        if board.castling_rights & chess.BB_SQUARES[sq]:
+            flags |= 1 << (i + 1)
+
+    ep = board.ep_square if board.ep_square is not None else -1
+    return packed, flags, ep
+
+
+def decode_position(record) -> chess.Board:
+    """Rebuilds a chess.Board from a record (move history is not stored)"""
+    board = chess.Board(None)
+    packed = np.asarray(record["board"], dtype=np.uint8)
+    codes = np.empty(64, dtype=np.uint8)
+    codes[0::2] = packed & 0x0F
+    codes[1::2] = packed >> 4
+    for sq in range(64):
+        code = int(codes[sq])
+        if code:
+            board.set_piece_at(sq, chess.Piece(code & 7, chess.WHITE if code < 8 else chess.BLACK))
+
+    flags = int(record["flags"])
+    board.turn = chess.WHITE if flags & 1 else chess.BLACK
+    for i, sq in enumerate(CASTLING_SQUARES):
+        if flags & (1 << (i + 1)):
+            board.castling_rights |= chess.BB_SQUARES[sq]
+    ep = int(record["ep"])
+    board.ep_square = ep if ep >= 0 else None
+    return board
+
+
+def _init_worker(evaluator_name, depth, node_limit):
+    global _engine
+    _engine = MinimaxEngine(name="Self-play", evaluator=getattr(evaluators, evaluator_name),
+                            use_alphabeta=True, max_depth=depth, node_limit=node_limit)
+
+
+def random_opening(rng: random.Random, min_plies, max_plies) -> chess.Board:
+    """Plays a random number of random forced-capture moves from the start position"""
+    while True:
+        board = chess.Board()
+        for _ in range(rng.randint(min_plies, max_plies)):
+            board.push(rng.choice(forcedCaptureLegalMoves(board)))
+            if board.is_game_over():
+                break
+        if not board.is_game_over():
+            return board
+
+
+def play_game(args):
+    """Pool worker: plays one self-play game and returns its records"""
+    game_id, min_opening, max_opening, max_plies = args
+    rng = random.Random(game_id)
+    board = random_opening(rng, min_opening, max_opening)
+
+    positions = []
+    while not board.is_game_over() and len(positions) < max_plies:
+        move = _engine.find_best_move(board, time_limit=None)
+        if move is None:
+            break
+        positions.append((encode_position(board), _engine.last_score, _engine.last_depth, board.ply()))
+        board.push(move)
+
+    records = np.zeros(len(positions), dtype=RECORD_DTYPE)
+    records["result"] = RESULTS.get(board.result(), 0)
+    records["game"] = game_id
+    for i, ((packed, flags, ep), score, depth, ply) in enumerate(positions):
+        records[i]["board"] = packed
+        records[i]["flags"] = flags
+        records[i]["ep"] = ep
+        records[i]["score"] = np.nan if score is None else score
+        records[i]["depth"] = depth
+        records[i]["ply"] = ply
+    return records
+
+
+class ShardWriter:
+    """
+    Appends records to fixed-size memory-mapped shards in directory and keeps
+    index.json in sync. Reopening an existing directory continues where it left off.
+    """
+
+    def __init__(self, directory, shard_size):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.index_path = os.path.join(directory, "index.json")
+
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+        else:
+            self.index = {"shard_size": shard_size, "shards": [], "positions": 0, "games": 0, "next_game": 0}
+
+        self.shard_size = self.index["shard_size"]
+        self.shard = None
+        if self.index["shards"] and self.index["shards"][-1]["count"] < self.shard_size:
+            self.shard = np.load(self._path(self.index["shards"][-1]["file"]), mmap_mode="r+")
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _new_shard(self):
+        name = f"shard_{len(self.index['shards']):05d}.npy"
+        self.shard = np.lib.format.open_memmap(self._path(name), mode="w+",
+                                               dtype=RECORD_DTYPE, shape=(self.shard_size,))
+        self.index["shards"].append({"file": name, "count": 0})
+
+    def append_game(self, records):
+        """Writes one game's records, then records the game in the index"""
+        start = 0
+        while start < len(records):
+            if self.shard is None:
+                self._new_shard()
+            entry = self.index["shards"][-1]
+            n = min(len(records) - start, self.shard_size - entry["count"])
+            self.shard[entry["count"]:entry["count"] + n] = records[start:start + n]
+            entry["count"] += n
+            start += n
+            if entry["count"] == self.shard_size:
+                self.shard.flush()
+                self.shard = None
+
+        if self.shard is not None:
+            self.shard.flush()
+        self.index["positions"] += len(records)
+        self.index["games"] += 1
+        if len(records):
+            self.index["next_game"] = max(self.index["next_game"], int(records["game"][0]) + 1)
+        self._write_index()
+
+    def _write_index(self):
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(tmp, self.index_path)
+
+
+def generate(directory, positions, shard_size=1_000_000, workers=None, evaluator_name="REvaluator",
+             depth=3, node_limit=1000, min_opening=4, max_opening=10, max_plies=300):
+    """
+    Plays self-play games until directory holds at least positions records.
+    At most 2 games per worker are in flight, so memory use stays constant.
+    """
+    writer = ShardWriter(directory, shard_size)
+    workers = workers or os.cpu_count() or 1
+    next_game = writer.index["next_game"]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(evaluator_name, depth, node_limit)) as pool:
+        pending = set()
+        while writer.index["positions"] < positions or pending:
+            while writer.index["positions"] < positions and len(pending) < 2 * workers:
+                pending.add(pool.submit(play_game, (next_game, min_opening, max_opening, max_plies)))
+                next_game += 1
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                writer.append_game(future.result())
+            print(f"{writer.index['positions']} positions, {writer.index['games']} games", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate self-play training positions")
+    parser.add_argument("output", help="output directory (resumed if it already exists)")
+    parser.add_argument("--positions", type=int, required=True, help="total number of positions to reach")
+    parser.add_argument("--shard-size", type=int, default=1_000_000, help="positions per shard file")
+    parser.add_argument("--workers", type=int, default=None, help="number of processes (default: CPU count)")
+    parser.add_argument("--evaluator", default="REvaluator", help="name of a function in evaluators.py")
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--nodes", type=int, default=1000, help="node limit per move")
+    parser.add_argument("--min-opening", type=int, default=4, help="minimum number of random opening plies")
+    parser.add_argument("--max-opening", type=int, default=10, help="maximum number of random opening plies")
+    parser.add_argument("--max-plies", type=int, default=300, help="recorded plies after which a game is scored a draw")
+    args = parser.parse_args()
+
+    if not callable(getattr(evaluators, args.evaluator, None)):
+        parser.error(f"unknown evaluator {args.evaluator}")
+
+    generate(args.output, args.positions, shard_size=args.shard_size, workers=args.workers,
+             evaluator_name=args.evaluator, depth=args.depth, node_limit=args.nodes,
+             min_opening=args.min_opening, max_opening=args.max_opening, max_plies=args.max_plies)
+
+
+if __name__ == "__main__":
+    main()
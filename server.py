@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import chess
+import evaluators
+from engine import ChessEngine
+from minimax_engine import MinimaxEngine
+from xboard_interface import XBoardHandler
+
+"""
+Multi-game engine server
+
+Hosts many XBoard sessions in one process, one XBoardHandler per connection on a
+local unix socket (or TCP port). Searches from all sessions are sent to a bounded
+pool of worker processes, each of which imports python-chess, loads the evaluator
+tables and builds its MinimaxEngine once at startup and then reuses it for every
+game, so a new game does not pay any startup cost.
+
+Start the server once:
+
+  python3 server.py --socket /tmp/third_place.sock --workers 8
+
+and point each XBoard instance at the lightweight client in xboard_client.py:
+
+  xboard -fcp "python3 xboard_client.py --socket /tmp/third_place.sock"
+"""
+
+# Engine owned by each search worker process, created once by _init_worker
+_engine = None
+
+
+def _init_worker(evaluator_name, max_depth, node_limit):
+    global _engine
+    _engine = MinimaxEngine(name="ThirdPlace", evaluator=getattr(evaluators, evaluator_name),
+                            use_alphabeta=True, max_depth=max_depth, node_limit=node_limit)
+
+
+def _search(board, max_depth, time_limit, node_limit, submitted_at=None):
+    """
+    Pool worker: runs one search on the worker's engine. The time the job spent
+    waiting in the pool queue is taken off time_limit, since XBoard's clock was
+    already running.
+    """
+    if time_limit is not None and submitted_at is not None:
+        time_limit = max(0.0, time_limit - (time.time() - submitted_at))
+    move = _engine.find_best_move(board, max_depth=max_depth, time_limit=time_limit, node_limit=node_limit)
+    return move.uci() if move else None
+
+
+class PoolEngine(ChessEngine):
+    """
+    Stand-in engine given to each session's XBoardHandler. Searches are run on
+    the shared worker pool; the calling thread blocks until the result is back.
+    If a worker dies, the pool is rebuilt and the search retried once.
+    """
+
+    def __init__(self, workers, initargs, name="PoolEngine"):
+        super().__init__(name=name)
+        self.workers = workers
+        self.initargs = initargs
+        self.pool_lock = threading.Lock()
+        self.pool = self._new_pool()
+
+    def _new_pool(self):
+        # spawned rather than forked workers, so a pool rebuilt while serving does not
+        # inherit the listening socket and keep it open after the server is gone
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"),
+                                   initializer=_init_worker, initargs=self.initargs)
+
+    def _replace_pool(self, broken):
+        # several sessions can see the same broken pool; only the first replaces it
+        with self.pool_lock:
+            if self.pool is broken:
+                broken.shutdown(wait=False, cancel_futures=True)
+                self.pool = self._new_pool()
+
+    def find_best_move(self, board: chess.Board, max_depth=None, time_limit=None, node_limit=None) -> chess.Move:
+        """Returns None (so XBoardHandler resigns) if the search fails even after rebuilding the pool"""
+        submitted_at = time.time()
+        for _ in range(2):
+            pool = self.pool
+            try:
+                uci = pool.submit(_search, board.copy(), max_depth, time_limit, node_limit, submitted_at).result()
+                return chess.Move.from_uci(uci) if uci else None
+            except BrokenProcessPool:
+                print("search worker died, restarting the worker pool", file=sys.stderr)
+                self._replace_pool(pool)
+        return None
+
+
+class EngineServer:
+    """Accepts XBoard connections and runs one XBoardHandler per connection"""
+
+    def __init__(self, workers=None, max_sessions=64, evaluator_name="REvaluator", max_depth=4, node_limit=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.engine = PoolEngine(self.workers, (evaluator_name, max_depth, node_limit))
+        # Session commands run on these threads so a blocking search does not stall the event loop
+        self.session_threads = ThreadPoolExecutor(max_workers=max_sessions)
+        self.sessions = asyncio.Semaphore(max_sessions)
+
+    def warm_up(self):
+        """Starts every worker process now rather than on the first search"""
+        futures = [self.engine.pool.submit(_search, chess.Board(), 1, None, None) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    async def handle_session(self, reader, writer):
+        async with self.sessions:
+            loop = asyncio.get_running_loop()
+            outbox = []
+            handler = XBoardHandler(self.engine, output=outbox.append)
+
+            try:
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    cmd = line.decode(errors="replace").strip()
+                    # XBoardHandler exits the process on quit; here it only ends the session
+                    if cmd in ("quit", "exit"):
+                        break
+
+                    try:
+                        await loop.run_in_executor(self.session_threads, handler.handle_command, cmd)
+                    except Exception:
+                        # a bad command is skipped, like unknown commands are
+                        print(f"error handling command {cmd!r}:", file=sys.stderr)
+                        traceback.print_exc()
+                    for out in outbox:
+                        writer.write((out + "\n").encode())
+                    outbox.clear()
+                    await writer.drain()
+            except ConnectionError:
+                # client went away mid-game
+                pass
+            finally:
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except ConnectionError:
+                    pass
+
+    async def serve(self, socket_path=None, port=None):
+        if socket_path is not None:
+            if os.path.exists(socket_path):
+                remove_stale_socket(socket_path)
+            server = await asyncio.start_unix_server(self.handle_session, path=socket_path)
+        else:
+            server = await asyncio.start_server(self.handle_session, host="127.0.0.1", port=port)
+
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.session_threads.shutdown(wait=False, cancel_futures=True)
+        self.engine.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def remove_stale_socket(socket_path):
+    """Removes a socket left behind by a server that is gone; exits if a server is still listening"""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except ConnectionRefusedError:
+        os.unlink(socket_path)
+        return
+    except OSError as e:
+        sys.exit(f"cannot use {socket_path}: {e}")
+    finally:
+        probe.close()
+    sys.exit(f"{socket_path} is in use by a running server")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host many XBoard sessions on a shared engine pool")
+    where = parser.add_mutually_exclusive_group(required=True)
+    where.add_argument("--socket", help="unix socket path to listen on")
+    where.add_argument("--port", type=int, help="localhost TCP port to listen on")
+    parser.add_argument("--workers", type=int, default=None, help="search processes (default: CPU count)")
+    parser.add_argument("--max-sessions", type=int, default=64, help="sessions served at once, others wait")
+    parser.add_argument("--evaluator", default="REvaluator", help="name of a function in evaluators.py")
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--nodes", type=int, default=None, help="node limit per move")
+    args = parser.parse_args()
+
+    if not callable(getattr(evaluators, args.evaluator, None)):
+        parser.error(f"unknown evaluator {args.evaluator}")
+
+    server = EngineServer(workers=args.workers, max_sessions=args.max_sessions,
+                          evaluator_name=args.evaluator, max_depth=args.depth, node_limit=args.nodes)
+    server.warm_up()
+    try:
+        asyncio.run(server.serve(args.socket, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,12 @@ import chess
 Functions for simulating engine vs engine tournaments
 """
 
-def simulateGame(engineA: ChessEngine, engineB: ChessEngine, debug=False):
+def simulateGame(engineA: ChessEngine, engineB: ChessEngine, debug=False, node_limit=None):
+    """
+    Plays one game with engineA as white. If node_limit is given, every move is
+    searched with that node budget and no clock, so the result does not depend
+    on machine load; otherwise each engine plays on a time budget.
+    """
     import time
     board = chess.Board()
     numMoves = 0
@@ -16,15 +21,15 @@ def simulateGame(engineA: ChessEngine, engineB: ChessEngine, debug=False):
     time_budget = 60.0
 
     # Optional: per-move timeout to prevent freezing
-    per_move_time_limit = 2.0
+    per_move_time_limit = 2.0 if node_limit is None else None
 
     while not board.is_game_over():
         # ----- ENGINE A MOVE -----
         start = time.time()
-        move = engineA.find_best_move(board, time_limit=per_move_time_limit)
+        move = engineA.find_best_move(board, time_limit=per_move_time_limit, node_limit=node_limit)
         timeA += time.time() - start
 
-        if timeA > time_budget:
+        if node_limit is None and timeA > time_budget:
             if debug:
                 print("Engine A flagged for time.")
             return "0-1"   # Engine A loses on time → Black wins
@@ -35,10 +40,10 @@ def simulateGame(engineA: ChessEngine, engineB: ChessEngine, debug=False):
 
         # ----- ENGINE B MOVE -----
         start = time.time()
-        move = engineB.find_best_move(board, time_limit=per_move_time_limit)
+        move = engineB.find_best_move(board, time_limit=per_move_time_limit, node_limit=node_limit)
         timeB += time.time() - start
 
-        if timeB > time_budget:
+        if node_limit is None and timeB > time_budget:
             if debug:
                 print("Engine B flagged for time.")
             return "1-0"   # Engine B loses on time → White wins
@@ -52,17 +57,18 @@ def simulateGame(engineA: ChessEngine, engineB: ChessEngine, debug=False):
 
     return board.result()
 
-def simulateTournament(engineA: ChessEngine, engineB: ChessEngine, n: int = 10):
+def simulateTournament(engineA: ChessEngine, engineB: ChessEngine, n: int = 10, node_limit=None):
   """
   Simulates n matches between the engines and prints results
+  With node_limit set, every game is played with a fixed node budget per move
   """
 
   score = {"AWins": 0, "Tie": 0, "BWins": 0}
   for game in range(n):
     if game % 2 == 0:
-      result = simulateGame(engineA, engineB)
+      result = simulateGame(engineA, engineB, node_limit=node_limit)
     else:
-      result = simulateGame(engineB, engineA)
+      result = simulateGame(engineB, engineA, node_limit=node_limit)
     
     if result == "1-0":
       if game % 2 == 0:
@@ -83,4 +89,4 @@ def simulateTournament(engineA: ChessEngine, engineB: ChessEngine, n: int = 10):
   return
 
 def displayResult(score, n):
-  print(f"{n} games played: (Engine A Wins, Ties, Engine B Wins) = ({score["AWins"]}, {score["Tie"]}, {score["BWins"]})")
\ No newline at end of file
+  print(f"{n} games played: (Engine A Wins, Ties, Engine B Wins) = ({score['AWins']}, {score['Tie']}, {score['BWins']})")
\ No newline at end of file
@@ -0,0 +1,57 @@
+import io
+import json
+
+import chess
+from analyze import analyze_stream, read_lines
+
+"""
+Checks for the batch analysis CLI, run with `python3 -m pytest test_analyze.py`
+"""
+
+INPUT = """\
+# a comment
+rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - id "start";
+
+rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2
+garbage
+knnnnnnk/8/8/8/8/8/8/K7 w - - 0 1
+7k/6Q1/6K1/8/8/8/8/8 b - - 0 1
+"""
+
+
+def run(text, **kwargs):
+    lines = [("input", n, line) for n, line in enumerate(io.StringIO(text), start=1)]
+    out = io.StringIO()
+    analyze_stream(lines, out, depth=1, workers=1, **kwargs)
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def test_records_in_input_order_skipping_blanks_and_comments():
+    # max_pending=2 forces results to be written while later lines are still queued
+    records = run(INPUT, max_pending=2)
+    assert [r["line"] for r in records] == [2, 4, 5, 6, 7]
+
+
+def test_epd_id_and_results():
+    start, e4e5, *_ = run(INPUT)
+    assert start["id"] == "start"
+    assert start["fen"] == chess.STARTING_FEN
+    assert chess.Move.from_uci(start["bestmove"]) in chess.Board().legal_moves
+    assert start["depth"] == 1 and start["nodes"] > 0
+    assert "id" not in e4e5
+
+
+def test_error_records():
+    records = {r["line"]: r for r in run(INPUT)}
+    assert "error" in records[5] and "fen" not in records[5]
+    assert records[6]["error"] == "invalid position: too_many_kings"
+    # a finished game is analyzed, not an error
+    assert records[7]["bestmove"] is None and records[7]["depth"] == 0
+
+
+def test_read_lines(tmp_path):
+    a = tmp_path / "a.fen"
+    b = tmp_path / "b.fen"
+    a.write_text("x\ny\n")
+    b.write_text("z\n")
+    assert list(read_lines([str(a), str(b)])) == [(str(a), 1, "x\n"), (str(a), 2, "y\n"), (str(b), 1, "z\n")]
@@ -0,0 +1,100 @@
+import time
+
+import chess
+from minimax_engine import MinimaxEngine
+from simulator import simulateGame
+
+"""
+Checks for MinimaxEngine search limits, run with `python3 -m pytest test_minimax_engine.py`
+"""
+
+VALUES = {chess.PAWN: 1, chess.KNIGHT: 3, chess.BISHOP: 3, chess.ROOK: 5, chess.QUEEN: 9, chess.KING: 0}
+
+MIDDLEGAME = "r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R b KQkq - 3 3"
+
+
+def material(board: chess.Board) -> float:
+    """Cheap evaluator so the tests stay fast"""
+    return sum(VALUES[p.piece_type] * (1 if p.color == chess.WHITE else -1) for p in board.piece_map().values())
+
+
+def board_with_history():
+    board = chess.Board()
+    for uci in ("e2e4", "e7e5", "g1f3", "b8c6"):
+        board.push_uci(uci)
+    return board
+
+
+def test_node_limit_is_deterministic():
+    engine = MinimaxEngine(evaluator=material)
+    results = set()
+    for _ in range(3):
+        move = engine.find_best_move(chess.Board(MIDDLEGAME), max_depth=4, time_limit=None, node_limit=500)
+        results.add((move, engine.nodes, engine.last_depth, engine.last_score))
+    assert len(results) == 1
+    assert engine.nodes == 500
+
+
+def test_board_restored_after_abort():
+    for use_alphabeta in (True, False):
+        engine = MinimaxEngine(evaluator=material, use_alphabeta=use_alphabeta)
+        # budgets that run out at various points inside the tree
+        for node_limit in (3, 40, 123, 777):
+            board = board_with_history()
+            before = (board.fen(), list(board.move_stack))
+            engine.find_best_move(board, max_depth=4, time_limit=None, node_limit=node_limit)
+            assert (board.fen(), list(board.move_stack)) == before
+
+
+def test_last_depth_is_deepest_finished_iteration():
+    engine = MinimaxEngine(evaluator=material)
+    board = chess.Board(MIDDLEGAME)
+
+    engine.find_best_move(board, max_depth=2, time_limit=None)
+    assert engine.last_depth == 2
+    depth2_nodes = engine.nodes
+    depth2_move = engine.find_best_move(board, max_depth=2, time_limit=None)
+
+    engine.find_best_move(board, max_depth=3, time_limit=None)
+    assert engine.last_depth == 3
+    assert engine.nodes > depth2_nodes + 1
+
+    # enough nodes for depths 1 and 2 but not 3
+    move = engine.find_best_move(board, max_depth=3, time_limit=None, node_limit=depth2_nodes + 1)
+    assert engine.last_depth == 2
+    assert move == depth2_move
+
+
+def test_no_moves_at_root():
+    engine = MinimaxEngine(evaluator=material)
+    mated = chess.Board("7k/6Q1/6K1/8/8/8/8/8 b - - 0 1")
+    assert mated.is_checkmate()
+    assert engine.find_best_move(mated, max_depth=3, time_limit=None) is None
+    assert engine.last_depth == 0 and engine.last_score is None and engine.nodes == 0
+
+
+def test_node_limited_game_never_flags(monkeypatch):
+    # every clock reading is 100s after the last, so a timed game would flag on the first move
+    clock = [0.0]
+
+    def fake_time():
+        clock[0] += 100.0
+        return clock[0]
+
+    monkeypatch.setattr(time, "time", fake_time)
+    engineA = MinimaxEngine(evaluator=material, max_depth=2)
+    engineB = MinimaxEngine(evaluator=material, max_depth=2)
+
+    assert simulateGame(engineA, engineB) == "0-1"
+
+    board_moves = []
+    original = engineA.find_best_move
+
+    def recording_find_best_move(board, **kwargs):
+        board_moves.append(board.ply())
+        return original(board, **kwargs)
+
+    engineA.find_best_move = recording_find_best_move
+    result = simulateGame(engineA, engineB, node_limit=100)
+    assert result in ("1-0", "0-1", "1/2-1/2")
+    assert len(board_moves) > 1
@@ -0,0 +1,35 @@
+import chess
+from perft import perft, divide, PerftTable
+
+"""
+Perft regression checks for forcedCaptureLegalMoves, run with `python3 -m pytest test_perft.py`
+"""
+
+# Start position counts for depths 1-4 (depth 5 is 2723795, too slow to run every time)
+START_COUNTS = [20, 400, 8067, 152955]
+
+
+def total(results):
+    return sum(count for _, count in results)
+
+
+def test_start_position_counts():
+    board = chess.Board()
+    for depth, expected in enumerate(START_COUNTS, start=1):
+        assert perft(board, depth) == expected
+    assert board.fen() == chess.STARTING_FEN
+
+
+def test_hash_and_processes_match_plain_run():
+    board = chess.Board()
+    plain = total(divide(board, 4))
+    assert plain == START_COUNTS[3]
+    assert total(divide(board, 4, hash_size=1 << 16)) == plain
+    assert total(divide(board, 4, processes=4)) == plain
+    assert total(divide(board, 4, hash_size=1 << 16, processes=4)) == plain
+
+
+def test_full_table_stays_bounded():
+    table = PerftTable(max_entries=100)
+    assert perft(chess.Board(), 4, table) == START_COUNTS[3]
+    assert len(table.entries) == 100
@@ -0,0 +1,57 @@
+import json
+
+import chess
+import numpy as np
+from selfplay import RECORD_DTYPE, ShardWriter, decode_position, encode_position
+
+"""
+Checks for the self-play record encoding and shard writer, run with `python3 -m pytest test_selfplay.py`
+"""
+
+FENS = [
+    chess.STARTING_FEN,
+    "r3k2r/8/8/3pP3/8/8/8/R3K2R w Kq d6 0 1",
+    "r3k2r/pppq1ppp/2n2n2/3pp3/4P3/2N2N2/PPPQ1PPP/R3K2R b KQ - 0 1",
+    "8/8/8/8/8/8/8/K6k w - - 0 1",
+]
+
+
+def test_encode_decode_round_trip():
+    for fen in FENS:
+        board = chess.Board(fen)
+        packed, flags, ep = encode_position(board)
+        decoded = decode_position({"board": packed, "flags": flags, "ep": ep})
+        # the clocks are not stored
+        assert decoded.epd() == board.epd()
+
+
+def make_game(game_id, n):
+    records = np.zeros(n, dtype=RECORD_DTYPE)
+    records["game"] = game_id
+    records["ply"] = np.arange(n)
+    return records
+
+
+def read_all(directory):
+    with open(directory / "index.json") as f:
+        index = json.load(f)
+    shards = [np.load(directory / s["file"], mmap_mode="r")[:s["count"]] for s in index["shards"]]
+    return index, np.concatenate(shards)
+
+
+def test_shard_writer_resumes(tmp_path):
+    writer = ShardWriter(str(tmp_path), shard_size=8)
+    writer.append_game(make_game(0, 5))
+    writer.append_game(make_game(1, 6))
+
+    # a new writer on the same directory picks up the half-full last shard
+    writer = ShardWriter(str(tmp_path), shard_size=100)
+    assert writer.index["next_game"] == 2
+    writer.append_game(make_game(2, 7))
+
+    index, records = read_all(tmp_path)
+    assert index["shard_size"] == 8
+    assert [s["count"] for s in index["shards"]] == [8, 8, 2]
+    assert index["positions"] == 18 and index["games"] == 3 and index["next_game"] == 3
+    assert list(records["game"]) == [0] * 5 + [1] * 6 + [2] * 7
+    assert list(records["ply"]) == list(range(5)) + list(range(6)) + list(range(7))
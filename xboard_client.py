@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+import argparse
+import socket
+import sys
+import threading
+
+"""
+XBoard client for server.py
+
+Forwards XBoard's commands on stdin to a running engine server and the server's
+replies to stdout. It only uses the standard library, so starting it is much
+cheaper than starting third_place.py:
+
+  xboard -fcp "python3 xboard_client.py --socket /tmp/third_place.sock"
+"""
+
+
+def connect(socket_path=None, port=None):
+    if socket_path is not None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(socket_path)
+    else:
+        sock = socket.create_connection(("127.0.0.1", port))
+
+    def forward_replies():
+        for line in sock.makefile("r"):
+            sys.stdout.write(line)
+            sys.stdout.flush()
+
+    threading.Thread(target=forward_replies, daemon=True).start()
+
+    for line in sys.stdin:
+        sock.sendall(line.encode())
+        if line.strip() in ("quit", "exit"):
+            break
+    sock.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Connect XBoard to a running server.py")
+    where = parser.add_mutually_exclusive_group(required=True)
+    where.add_argument("--socket", help="unix socket path of the server")
+    where.add_argument("--port", type=int, help="localhost TCP port of the server")
+    args = parser.parse_args()
+    connect(args.socket, args.port)
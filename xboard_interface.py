@@ -9,11 +9,14 @@ def print_flush(s):
 
 
 class XBoardHandler:
-    def __init__(self, engine: ChessEngine):
+    def __init__(self, engine: ChessEngine, output=print_flush):
         self.board = chess.Board()
         self.engine = engine
         self.force_mode = False
 
+        # Called with every line sent back to XBoard (stdout by default)
+        self.output = output
+
         # Time control
         self.time_left = 0
         self.move_number = 0
@@ -69,7 +72,7 @@ class XBoardHandler:
             return
 
         elif cmd.startswith("protover"):
-            print_flush(
+            self.output(
                 'feature myname="ThirdPlace" '
                 'usermove=1 '
                 'setboard=1 '
@@ -147,12 +150,12 @@ class XBoardHandler:
         best = self.engine.find_best_move(self.board, time_limit=time_limit)
 
         if not best:
-            print_flush("resign")
+            self.output("resign")
             return
         
         self.move_number += 1
         self.board.push(best)
-        print_flush(f"move {best.uci()}")
+        self.output(f"move {best.uci()}")
 
     # -----------------------------------------
     # Handle user move safely